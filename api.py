@@ -9,6 +9,9 @@ CORS(app) # Allow requests from your React app's origin (e.g., localhost:3000)
 
 converter = UnitConverter()
 
+# Upper bound on the number of conversions accepted by /convert/batch
+MAX_BATCH_SIZE = 1000
+
 # --- Add get_conversion_explanation function here if not in unit_converter.py ---
 # Make sure this function is available
 # def get_conversion_explanation(conversion_type, from_unit, to_unit, input_value, result):
@@ -78,12 +81,10 @@ def get_units():
     return jsonify(units_data)
 
 
-@app.route('/convert', methods=['POST'])
-def convert():
-    """Performs a unit conversion."""
-    data = request.get_json()
-    if not data:
-        return jsonify({"error": "Invalid input"}), 400
+def _perform_conversion(data):
+    """Converts a single request payload. Returns a (response body, HTTP status) pair."""
+    if not isinstance(data, dict):
+        return {"error": "Invalid input"}, 400
 
     conv_type = data.get('type')
     value_str = data.get('value')
@@ -91,12 +92,15 @@ def convert():
     to_unit = data.get('toUnit')
 
     if not all([conv_type, value_str is not None, from_unit, to_unit]):
-        return jsonify({"error": "Missing required fields (type, value, fromUnit, toUnit)"}), 400
+        return {"error": "Missing required fields (type, value, fromUnit, toUnit)"}, 400
+
+    if not all(isinstance(field, str) for field in (conv_type, from_unit, to_unit)):
+        return {"error": "Fields type, fromUnit and toUnit must be strings"}, 400
 
     try:
         value = float(value_str)
-    except ValueError:
-        return jsonify({"error": "Invalid input value, must be a number"}), 400
+    except (TypeError, ValueError):
+        return {"error": "Invalid input value, must be a number"}, 400
 
     # Map frontend type name (e.g., "Length") to backend key (e.g., "length")
     type_key = conv_type.lower()
@@ -126,22 +130,56 @@ def convert():
                  # Assuming _convert can handle it based on type_key
                  result = converter._convert(value, from_unit, to_unit, type_key)
         else:
-            return jsonify({"error": f"Unknown conversion type: {conv_type}"}), 400
+            return {"error": f"Unknown conversion type: {conv_type}"}, 400
 
         # Get explanation using the function (ensure it's accessible)
         explanation = get_conversion_explanation(conv_type, from_unit, to_unit, value, result)
 
-        return jsonify({
+        return {
             "result": result,
             "explanation": explanation
-        })
+        }, 200
 
     except ValueError as e:
-        return jsonify({"error": str(e)}), 400
+        return {"error": str(e)}, 400
     except Exception as e:
         # Catch broader exceptions for unexpected errors
         app.logger.error(f"Conversion error: {e}", exc_info=True) # Log the full error
-        return jsonify({"error": "An internal server error occurred."}), 500
+        return {"error": "An internal server error occurred."}, 500
+
+
+@app.route('/convert', methods=['POST'])
+def convert():
+    """Performs a unit conversion."""
+    data = request.get_json()
+    if not data:
+        return jsonify({"error": "Invalid input"}), 400
+
+    body, status = _perform_conversion(data)
+    return jsonify(body), status
+
+
+@app.route('/convert/batch', methods=['POST'])
+def convert_batch():
+    """Performs several unit conversions in one request.
+
+    Expects {"conversions": [<convert payload>, ...]} and answers with
+    {"results": [...]} in the same order. Each result carries its own
+    "status" so one bad item does not fail the whole batch.
+    """
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict) or not isinstance(data.get('conversions'), list):
+        return jsonify({"error": "Invalid input, expected a 'conversions' list"}), 400
+    if len(data['conversions']) > MAX_BATCH_SIZE:
+        return jsonify({"error": f"Too many conversions, at most {MAX_BATCH_SIZE} per batch"}), 413
+
+    results = []
+    for item in data['conversions']:
+        body, status = _perform_conversion(item)
+        body["status"] = status
+        results.append(body)
+
+    return jsonify({"results": results})
 
 
 if __name__ == '__main__':
@@ -0,0 +1,254 @@
+# api_client.py
+"""
+Async Python client for the conversion API in api.py.
+
+Connections are kept alive and reused from a small pool, and single-value
+convert() calls issued concurrently within a short window are coalesced into
+one POST /convert/batch request whose results are fanned back out to the
+individual callers.
+
+Example usage:
+
+    async with ConversionClient("http://localhost:5001") as client:
+        out = await client.convert("Length", 5, "km", "mi")
+        print(out["result"], out["explanation"])
+"""
+import asyncio
+import http.client
+import json
+import queue
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+
+class ConversionError(Exception):
+    """Raised when the API rejects a conversion or answers with an error."""
+
+    def __init__(self, message, status=None):
+        super().__init__(message)
+        self.status = status
+
+
+class _ConnectionPool:
+    """
+    A pool of keep-alive HTTP connections to a single host.
+
+    Connections are blocking http.client connections; callers run requests on
+    a worker thread and hand the connection back once the response is read.
+    """
+
+    def __init__(self, host, port, timeout):
+        self._host = host
+        self._port = port
+        self._timeout = timeout
+        self._idle = queue.LifoQueue()
+
+    def _acquire(self):
+        try:
+            return self._idle.get_nowait(), True
+        except queue.Empty:
+            return http.client.HTTPConnection(self._host, self._port, timeout=self._timeout), False
+
+    def request(self, method, path, payload=None):
+        """
+        Sends a request and returns (status, decoded JSON body).
+
+        The payload is JSON-encoded unless it is already bytes.
+        """
+        if payload is None or isinstance(payload, bytes):
+            body = payload
+        else:
+            body = json.dumps(payload).encode('utf-8')
+        headers = {'Accept': 'application/json', 'Connection': 'keep-alive'}
+        if body is not None:
+            headers['Content-Type'] = 'application/json'
+
+        while True:
+            conn, reused = self._acquire()
+            try:
+                conn.request(method, path, body=body, headers=headers)
+                response = conn.getresponse()
+                data = response.read()
+            except (http.client.RemoteDisconnected, ConnectionError):
+                conn.close()
+                # An idle connection may have been closed by the server; retry on a fresh one
+                if reused:
+                    continue
+                raise
+            except Exception:
+                conn.close()
+                raise
+
+            if response.will_close:
+                conn.close()
+            else:
+                self._idle.put(conn)
+            try:
+                return response.status, json.loads(data) if data else None
+            except ValueError:
+                # Not JSON, e.g. an HTML error page; callers report it by status code
+                return response.status, None
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+class ConversionClient:
+    """
+    Asyncio client for the conversion API with connection pooling and request coalescing.
+
+    :param base_url: Root URL of the API server.
+    :param max_connections: Maximum number of concurrent HTTP connections.
+    :param batch_window: Seconds to wait for more convert() calls before sending a batch.
+    :param max_batch_size: A batch is sent immediately once it holds this many conversions.
+    :param timeout: Socket timeout in seconds for each request.
+    """
+
+    def __init__(self, base_url="http://localhost:5001", max_connections=8,
+                 batch_window=0.002, max_batch_size=256, timeout=10.0):
+        parts = urlsplit(base_url)
+        if parts.scheme != 'http':
+            raise ValueError(f"Unsupported URL scheme: {parts.scheme!r}")
+        if max_connections < 1 or max_batch_size < 1:
+            raise ValueError("max_connections and max_batch_size must be at least 1")
+
+        self._prefix = parts.path.rstrip('/')
+        self._pool = _ConnectionPool(parts.hostname, parts.port or 80, timeout)
+        self._executor = ThreadPoolExecutor(max_workers=max_connections,
+                                            thread_name_prefix='conversion-client')
+        self._batch_window = batch_window
+        self._max_batch_size = max_batch_size
+        self._pending = []
+        self._flush_handle = None
+        self._in_flight = set()
+        self._closed = False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def _request(self, method, path, payload=None):
+        if self._closed:
+            raise RuntimeError("ConversionClient is closed")
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, self._pool.request, method, self._prefix + path, payload)
+
+    async def get_units(self):
+        """Returns the available units for each conversion type."""
+        status, body = await self._request('GET', '/units')
+        if status != 200:
+            raise ConversionError(_error_message(body), status)
+        return body
+
+    async def convert(self, conv_type, value, from_unit, to_unit):
+        """
+        Converts a single value.
+
+        Concurrent calls are coalesced into batched requests. Returns a dict
+        with "result" and "explanation", or raises ConversionError.
+        """
+        if self._closed:
+            raise RuntimeError("ConversionClient is closed")
+        try:
+            # Encode now so a value JSON cannot represent fails this call, not its whole batch
+            payload = json.dumps({
+                'type': conv_type,
+                'value': value,
+                'fromUnit': from_unit,
+                'toUnit': to_unit,
+            })
+        except (TypeError, ValueError) as e:
+            raise ConversionError(f"Conversion arguments are not JSON serializable: {e}") from e
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((payload, future))
+
+        if len(self._pending) >= self._max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self._batch_window, self._flush)
+        return await future
+
+    async def convert_many(self, conversions):
+        """
+        Converts several (conv_type, value, from_unit, to_unit) tuples.
+
+        Returns the results in order; the first failing conversion raises ConversionError.
+        """
+        return await asyncio.gather(*(self.convert(*c) for c in conversions))
+
+    def _flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        while self._pending:
+            batch = self._pending[:self._max_batch_size]
+            del self._pending[:self._max_batch_size]
+            task = asyncio.ensure_future(self._send_batch(batch))
+            self._in_flight.add(task)
+            task.add_done_callback(self._in_flight.discard)
+
+    async def _send_batch(self, batch):
+        status = None
+        try:
+            # Payloads were encoded one by one in convert(), so the batch body is just joined
+            body = ('{"conversions": [' + ', '.join(payload for payload, _ in batch) + ']}').encode('utf-8')
+            status, response = await self._request('POST', '/convert/batch', body)
+            if status != 200:
+                raise ConversionError(_error_message(response), status)
+            results = response.get('results') if isinstance(response, dict) else None
+            if not isinstance(results, list) or len(results) != len(batch):
+                raise ConversionError("Malformed batch response from server", status)
+
+            for (_, future), item in zip(batch, results):
+                if future.done():
+                    continue
+                if not isinstance(item, dict):
+                    future.set_exception(ConversionError("Malformed batch response from server", status))
+                    continue
+                item_status = item.pop('status', 200)
+                if item_status != 200 or 'error' in item:
+                    future.set_exception(ConversionError(_error_message(item), item_status))
+                else:
+                    future.set_result(item)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    # One instance per caller, so re-raising in different tasks keeps tracebacks apart
+                    future.set_exception(_chained_error(str(e), getattr(e, 'status', status), e))
+        finally:
+            # Never leave a caller waiting, e.g. when this task is cancelled mid-request
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(ConversionError("Batch request did not complete", status))
+
+    async def close(self):
+        """Sends any pending conversions, then releases all connections."""
+        if self._closed:
+            return
+        self._flush()
+        if self._in_flight:
+            await asyncio.gather(*self._in_flight, return_exceptions=True)
+        self._closed = True
+        self._executor.shutdown(wait=True)
+        self._pool.close()
+
+
+def _error_message(body):
+    if isinstance(body, dict) and body.get('error'):
+        return body['error']
+    return "Unexpected response from server"
+
+
+def _chained_error(message, status, cause):
+    error = ConversionError(message, status)
+    error.__cause__ = cause
+    return error
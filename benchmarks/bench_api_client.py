@@ -0,0 +1,107 @@
+"""
+Benchmark naive per-call POST /convert requests against the pooled, coalescing ConversionClient.
+
+Both modes run the same number of conversions from the same number of concurrent
+asyncio callers and report throughput and latency percentiles.
+
+Usage:
+    python benchmarks/bench_api_client.py [--requests N] [--concurrency C] [--url URL]
+
+Without --url a local API server is started on a free port. Note that the
+Flask development server closes every connection after one response, so the
+keep-alive part of the gain only shows up against a production WSGI server
+(e.g. gunicorn or waitress) passed via --url.
+"""
+import sys
+import os
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+import asyncio
+import json
+import logging
+import statistics
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from api_client import ConversionClient
+
+
+def _start_local_server():
+    from werkzeug.serving import make_server
+    import api
+
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+    server = make_server('127.0.0.1', 0, api.app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
+def _naive_convert(url, value):
+    """One fresh connection and one POST /convert per value."""
+    body = json.dumps({'type': 'Length', 'value': value, 'fromUnit': 'km', 'toUnit': 'mi'}).encode('utf-8')
+    req = urllib.request.Request(url + '/convert', data=body, headers={'Content-Type': 'application/json'})
+    with urllib.request.urlopen(req) as response:
+        return json.loads(response.read())
+
+
+async def _run(call, total, concurrency):
+    latencies = []
+    counter = iter(range(total))
+
+    async def worker():
+        for i in counter:
+            start = time.perf_counter()
+            await call(i)
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return time.perf_counter() - start, latencies
+
+
+async def bench_naive(url, total, concurrency):
+    loop = asyncio.get_running_loop()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        return await _run(lambda i: loop.run_in_executor(executor, _naive_convert, url, i),
+                          total, concurrency)
+
+
+async def bench_client(url, total, concurrency):
+    async with ConversionClient(url) as client:
+        return await _run(lambda i: client.convert('Length', i, 'km', 'mi'), total, concurrency)
+
+
+def _report(name, elapsed, latencies):
+    latencies = sorted(latencies)
+    q = statistics.quantiles(latencies, n=100)
+    print(f"{name:<10} {len(latencies) / elapsed:>10.0f} req/s   "
+          f"p50 {q[49] * 1000:>7.2f} ms   p95 {q[94] * 1000:>7.2f} ms   p99 {q[98] * 1000:>7.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--requests', type=int, default=2000, help="conversions per mode")
+    parser.add_argument('--concurrency', type=int, default=32, help="concurrent callers")
+    parser.add_argument('--url', help="benchmark an already running server instead of a local one")
+    args = parser.parse_args()
+
+    server = None
+    url = args.url
+    if url is None:
+        server, url = _start_local_server()
+
+    try:
+        print(f"{args.requests} conversions, {args.concurrency} concurrent callers, {url}")
+        _report('naive', *asyncio.run(bench_naive(url, args.requests, args.concurrency)))
+        _report('pooled', *asyncio.run(bench_client(url, args.requests, args.concurrency)))
+    finally:
+        if server is not None:
+            server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
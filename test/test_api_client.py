@@ -0,0 +1,322 @@
+import sys
+import os
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import asyncio
+import json
+import threading
+import time
+import unittest
+from decimal import Decimal
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+try:
+    from werkzeug.serving import make_server
+    import api
+except ImportError:  # Flask is only needed to run the server side
+    api = None
+
+from api_client import ConversionClient, ConversionError, _ConnectionPool
+
+
+class _KeepAliveHandler(BaseHTTPRequestHandler):
+    """Answers every GET with the id of the socket it arrived on"""
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        body = json.dumps({'connection': id(self.connection)}).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        if self.path == '/close':
+            self.send_header('Connection', 'close')
+        self.end_headers()
+        self.wfile.write(body)
+        if self.path == '/drop':
+            # Close without announcing it, as an idle-timeout on the server would
+            self.close_connection = True
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestConnectionPool(unittest.TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), _KeepAliveHandler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.pool = _ConnectionPool('127.0.0.1', self.server.server_port, timeout=5)
+
+    def tearDown(self):
+        self.pool.close()
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+
+    def test_connections_are_reused(self):
+        """Test that sequential requests reuse a pooled keep-alive connection"""
+        _, first = self.pool.request('GET', '/')
+        _, second = self.pool.request('GET', '/')
+        self.assertEqual(first['connection'], second['connection'])
+        self.assertEqual(self.pool._idle.qsize(), 1)
+
+    def test_closed_connections_are_dropped(self):
+        """Test that connections the server closes are not returned to the pool"""
+        status, _ = self.pool.request('GET', '/close')
+        self.assertEqual(status, 200)
+        self.assertEqual(self.pool._idle.qsize(), 0)
+
+    def test_stale_connection_is_retried(self):
+        """Test that a pooled connection closed by the server is replaced transparently"""
+        self.pool.request('GET', '/drop')
+        self.assertEqual(self.pool._idle.qsize(), 1)
+        status, _ = self.pool.request('GET', '/')
+        self.assertEqual(status, 200)
+
+
+class _StubApiHandler(BaseHTTPRequestHandler):
+    """Misbehaving API server; the first path segment selects the failure mode"""
+    protocol_version = 'HTTP/1.1'
+
+    def _send(self, status, body, content_type):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        mode = self.path.split('/')[1]
+        if mode == 'html500':
+            self._send(500, b'<html><body>Internal Server Error</body></html>', 'text/html')
+        elif mode == 'missing':
+            self._send(404, b'<html><body>Not Found</body></html>', 'text/html')
+        elif mode == 'slow':
+            time.sleep(0.5)
+            self._send(200, json.dumps({'results': []}).encode('utf-8'), 'application/json')
+        elif mode == 'malformed':
+            # Items with a string value come back as something other than an object
+            results = [item['value'] if isinstance(item['value'], str)
+                       else {'result': item['value'], 'explanation': '', 'status': 200}
+                       for item in payload['conversions']]
+            self._send(200, json.dumps({'results': results}).encode('utf-8'), 'application/json')
+        else:
+            self._send(200, b'not json', 'text/plain')
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestClientErrorResponses(unittest.IsolatedAsyncioTestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), _StubApiHandler)
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_port}"
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        cls.thread.join()
+
+    async def _convert_two(self, mode, first_value=1):
+        async with ConversionClient(f"{self.base_url}/{mode}", batch_window=0.01) as client:
+            return await asyncio.wait_for(asyncio.gather(
+                client.convert('Length', first_value, 'm', 'cm'),
+                client.convert('Length', 2, 'm', 'cm'),
+                return_exceptions=True,
+            ), timeout=5)
+
+    async def test_html_500_response(self):
+        """Test that a non-JSON 500 page becomes a ConversionError for every caller"""
+        results = await self._convert_two('html500')
+        for error in results:
+            self.assertIsInstance(error, ConversionError)
+            self.assertEqual(error.status, 500)
+
+    async def test_each_caller_gets_own_error(self):
+        """Test that callers in a failed batch get distinct, chained exception instances"""
+        first, second = await self._convert_two('html500')
+        self.assertIsNot(first, second)
+        self.assertIsInstance(first.__cause__, ConversionError)
+
+    async def test_cancelled_batch_settles_callers(self):
+        """Test that cancelling an in-flight batch fails its callers instead of leaving them waiting"""
+        async with ConversionClient(f"{self.base_url}/slow", batch_window=0) as client:
+            calls = asyncio.gather(
+                client.convert('Length', 1, 'm', 'cm'),
+                client.convert('Length', 2, 'm', 'cm'),
+                return_exceptions=True,
+            )
+            while not client._in_flight:
+                await asyncio.sleep(0.001)
+            for task in list(client._in_flight):
+                task.cancel()
+            results = await asyncio.wait_for(calls, timeout=5)
+        for error in results:
+            self.assertIsInstance(error, ConversionError)
+
+    async def test_missing_batch_endpoint(self):
+        """Test that a server without /convert/batch is reported with its status code"""
+        results = await self._convert_two('missing')
+        self.assertEqual([e.status for e in results], [404, 404])
+
+    async def test_non_json_success_response(self):
+        """Test that a 200 response that is not JSON is reported as malformed"""
+        results = await self._convert_two('notjson')
+        for error in results:
+            self.assertIsInstance(error, ConversionError)
+            self.assertEqual(error.status, 200)
+
+    async def test_malformed_batch_item(self):
+        """Test that a non-object result item fails only its own caller"""
+        bad, good = await self._convert_two('malformed', first_value='bad')
+        self.assertIsInstance(bad, ConversionError)
+        self.assertEqual(good['result'], 2)
+
+
+@unittest.skipIf(api is None, "flask and flask-cors are required to start the API server")
+class TestBatchEndpoint(unittest.TestCase):
+    def setUp(self):
+        self.client = api.app.test_client()
+
+    def test_malformed_items_fail_individually(self):
+        """Test that non-string fields and non-object items fail only their own entry"""
+        response = self.client.post('/convert/batch', json={'conversions': [
+            {'type': 5, 'value': 1, 'fromUnit': 'm', 'toUnit': 'cm'},
+            {'type': 'Length', 'value': 1, 'fromUnit': ['m'], 'toUnit': 'cm'},
+            [1, 2],
+            {'type': 'Length', 'value': 1, 'fromUnit': 'm', 'toUnit': 'cm'},
+        ]})
+        self.assertEqual(response.status_code, 200)
+        results = response.get_json()['results']
+        self.assertEqual([r['status'] for r in results], [400, 400, 400, 200])
+        self.assertAlmostEqual(results[3]['result'], 100.0)
+
+    def test_non_object_body(self):
+        """Test that a top-level JSON array is rejected with 400"""
+        response = self.client.post('/convert/batch', json=[1, 2])
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('error', response.get_json())
+
+    def test_batch_size_limit(self):
+        """Test that batches above MAX_BATCH_SIZE are rejected"""
+        item = {'type': 'Length', 'value': 1, 'fromUnit': 'm', 'toUnit': 'cm'}
+        response = self.client.post('/convert/batch', json={'conversions': [item] * (api.MAX_BATCH_SIZE + 1)})
+        self.assertEqual(response.status_code, 413)
+
+    def test_convert_rejects_non_string_type(self):
+        """Test that /convert answers a non-string type with 400 instead of 500"""
+        response = self.client.post('/convert', json={'type': 5, 'value': 1, 'fromUnit': 'm', 'toUnit': 'cm'})
+        self.assertEqual(response.status_code, 400)
+
+
+@unittest.skipIf(api is None, "flask and flask-cors are required to start the API server")
+class TestConversionClient(unittest.IsolatedAsyncioTestCase):
+    @classmethod
+    def setUpClass(cls):
+        """Start the API server on a free local port"""
+        cls.server = make_server('127.0.0.1', 0, api.app, threaded=True)
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_port}"
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.thread.join()
+
+    async def asyncSetUp(self):
+        self.client = ConversionClient(self.base_url, batch_window=0.01)
+        self.batches = []
+        send_batch = self.client._send_batch
+
+        async def recording_send_batch(batch):
+            self.batches.append(len(batch))
+            await send_batch(batch)
+
+        self.client._send_batch = recording_send_batch
+
+    async def asyncTearDown(self):
+        await self.client.close()
+
+    async def test_single_conversion(self):
+        """Test a single convert() call"""
+        out = await self.client.convert('Length', 1, 'km', 'm')
+        self.assertAlmostEqual(out['result'], 1000.0)
+        self.assertIn('explanation', out)
+        self.assertEqual(self.batches, [1])
+
+    async def test_concurrent_calls_are_coalesced(self):
+        """Test that concurrent calls are sent as one batch and fanned back out"""
+        values = list(range(50))
+        results = await asyncio.gather(*(self.client.convert('Length', v, 'm', 'cm') for v in values))
+        self.assertEqual([r['result'] for r in results], [v * 100.0 for v in values])
+        self.assertEqual(self.batches, [50])
+
+    async def test_max_batch_size(self):
+        """Test that batches are split at max_batch_size"""
+        self.client._max_batch_size = 4
+        results = await self.client.convert_many([('Mass', 1, 'kg', 'g')] * 10)
+        self.assertEqual([r['result'] for r in results], [1000.0] * 10)
+        self.assertEqual(sum(self.batches), 10)
+        self.assertTrue(all(size <= 4 for size in self.batches))
+
+    async def test_errors_are_per_call(self):
+        """Test that one invalid conversion does not fail the rest of its batch"""
+        good, bad, temp = await asyncio.gather(
+            self.client.convert('Time', 1, 'hr', 'min'),
+            self.client.convert('Length', 1, 'm', 'invalid_unit'),
+            self.client.convert('Temperature', 0, 'C', 'F'),
+            return_exceptions=True,
+        )
+        self.assertAlmostEqual(good['result'], 60.0)
+        self.assertIsInstance(bad, ConversionError)
+        self.assertEqual(bad.status, 400)
+        self.assertAlmostEqual(temp['result'], 32.0)
+        self.assertEqual(self.batches, [3])
+
+    async def test_malformed_call_does_not_fail_batch(self):
+        """Test that a non-string type fails only its own call"""
+        bad, good = await asyncio.gather(
+            self.client.convert(5, 1, 'm', 'cm'),
+            self.client.convert('Length', 1, 'm', 'cm'),
+            return_exceptions=True,
+        )
+        self.assertIsInstance(bad, ConversionError)
+        self.assertEqual(bad.status, 400)
+        self.assertAlmostEqual(good['result'], 100.0)
+        self.assertEqual(self.batches, [2])
+
+    async def test_unencodable_value_does_not_fail_batch(self):
+        """Test that a value JSON cannot encode fails only its own call"""
+        good, decimal_value, object_value = await asyncio.gather(
+            self.client.convert('Length', 1, 'm', 'cm'),
+            self.client.convert('Length', Decimal('2'), 'm', 'cm'),
+            self.client.convert('Length', object(), 'm', 'cm'),
+            return_exceptions=True,
+        )
+        self.assertAlmostEqual(good['result'], 100.0)
+        self.assertIsInstance(decimal_value, ConversionError)
+        self.assertIsInstance(object_value, ConversionError)
+        self.assertEqual(self.batches, [1])
+
+    async def test_get_units(self):
+        """Test fetching the unit listing"""
+        units = await self.client.get_units()
+        self.assertIn('Length', units)
+        self.assertEqual(units['Temperature'], ['Celsius', 'Fahrenheit', 'Kelvin'])
+
+    async def test_closed_client(self):
+        """Test that a closed client rejects new calls"""
+        await self.client.close()
+        with self.assertRaises(RuntimeError):
+            await self.client.convert('Length', 1, 'm', 'cm')
+
+
+if __name__ == '__main__':
+    unittest.main()